@@ -0,0 +1,118 @@
+"""
+Benchmark pipeline time with logging enabled.
+
+Modes:
+- legacy: the pre-queue behaviour, per-tree INFO f-strings through basicConfig handlers
+- sync: current code (per-tree messages at DEBUG) through basicConfig handlers
+- queue: current code through the queue-backed setup_logging
+
+Usage:
+    PYTHONPATH=. python benchmarks/logging_benchmark.py [--trees 100000] [--log-level INFO]
+
+Each mode runs in its own subprocess (console output discarded) so logging
+configuration does not leak between runs.
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import config
+from src.logger_config import setup_logging, stop_logging
+from src.metrics import calculate_tree_height, calculate_dbh
+from src.processor import process_trees
+
+
+def make_trees(n_trees: int, seed: int = 0):
+    """
+    Build n_trees synthetic trees with enough trunk points at breast height for DBH.
+    """
+    rng = np.random.default_rng(seed)
+    trees = {}
+    for tid in range(1, n_trees + 1):
+        angles = rng.uniform(0, 2 * np.pi, config.DBH_MIN_POINTS + 1)
+        trunk = np.column_stack([0.2 * np.cos(angles), 0.2 * np.sin(angles),
+                                 np.full(len(angles), config.DBH_HEIGHT)])
+        crown = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, rng.uniform(5, 30)]])
+        trees[tid] = {
+            'xyz': np.vstack([trunk, crown]),
+            'classification': np.array([config.TRUNK_CLASS] * len(trunk) + [config.CANOPY_CLASS] * 2)
+        }
+    return trees
+
+
+def legacy_process_trees(trees):
+    """
+    Per-tree loop as it was before queue logging: eager f-strings logged at INFO.
+    """
+    logger = logging.getLogger("src.processor")
+    metrics = {}
+    for tree_id, tree_data in trees.items():
+        logger.info(f"Processing tree {tree_id}")
+
+        height = calculate_tree_height(tree_data)
+        logger.info(f"Calculated tree height: {height:.3f}m")
+        logger.info(f"Tree {tree_id} height: {height:.3f}m")
+
+        dbh = calculate_dbh(tree_data)
+        if dbh is not None:
+            logger.info(f"Calculated DBH: {dbh:.3f}m")
+            logger.info(f"Tree {tree_id} DBH: {dbh:.3f}m")
+
+        metrics[tree_id] = {'height': height, 'dbh': dbh}
+    return metrics
+
+
+def run_mode(mode: str, n_trees: int, log_level: str) -> None:
+    trees = make_trees(n_trees)
+    log_file = os.path.join(tempfile.mkdtemp(), 'bench.log')
+
+    if mode in ('legacy', 'sync'):
+        logging.basicConfig(
+            level=getattr(logging, log_level),
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[logging.StreamHandler(), logging.FileHandler(log_file)]
+        )
+    else:
+        setup_logging(log_file, log_level)
+
+    start = time.perf_counter()
+    if mode == 'legacy':
+        legacy_process_trees(trees)
+    else:
+        process_trees(trees)
+    pipeline = time.perf_counter() - start
+
+    if mode == 'queue':
+        stop_logging()
+    logging.shutdown()
+    total = time.perf_counter() - start
+
+    print(f"{mode:>6} ({log_level}): pipeline {pipeline:.2f}s, including log drain {total:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trees", type=int, default=100_000, help="Number of synthetic trees")
+    parser.add_argument("--log-level", choices=['DEBUG', 'INFO'], default='INFO',
+                        help="Logging level used for both runs")
+    parser.add_argument("--mode", choices=['legacy', 'sync', 'queue'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.trees, args.log_level)
+        return
+
+    for mode in ('legacy', 'sync', 'queue'):
+        subprocess.run([sys.executable, __file__, "--trees", str(args.trees),
+                        "--log-level", args.log_level, "--mode", mode],
+                       stderr=subprocess.DEVNULL, check=True)
+
+
+if __name__ == "__main__":
+    main()
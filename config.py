@@ -15,6 +15,19 @@ CANOPY_CLASS = 3
 # Output parameters
 DEFAULT_OUTPUT_FILE = "outputs/tree_metrics.csv"
 
+# Summary statistics parameters
+SUMMARY_PERCENTILES = (5, 25, 50, 75, 95)
+SUMMARY_QUANTILE_ACCURACY = 0.01  # Relative error of approximate percentiles
+
 # Visualization parameters
 POINT_SIZE = 3
-COLOR_MAP = "jet"
\ No newline at end of file
+COLOR_MAP = "jet"
+PLOT_DPI = 300
+PLOT_HISTOGRAM_BINS = 10
+PLOT_HEXBIN_THRESHOLD = 5000  # Above this many trees, scatter plots use hexbin density
+PLOT_INLINE_MAX_TREES = 1000  # Up to this many trees, plots are drawn without a background process
+
+# Level-of-detail rendering parameters
+LOD_POINT_BUDGET = 1_000_000  # Maximum number of points rendered in the overview
+LOD_MAX_LEVELS = 12  # Number of voxel pyramid levels
+LOD_CACHE_DIR = "outputs/.lod_cache"  # Directory for cached LOD pyramids
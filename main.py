@@ -11,7 +11,8 @@ from src.logger_config import setup_logging
 from src.io import read_las_file
 from src.exporter import export_metrics_to_csv
 from src.processor import process_point_cloud
-from src.exporter import visualize_with_pyvista, create_metrics_summary
+from src.stats import create_metric_stats
+from src.exporter import visualize_with_pyvista, create_metrics_summary, wait_for_plots
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Process Lidar point cloud data to extract tree metrics")
@@ -20,6 +21,9 @@ def parse_arguments():
                         help="Path to the output CSV file")
     parser.add_argument("--visualize", "-v", action="store_true",
                         help="Create visualization plots")
+    parser.add_argument("--wait-for-plots", action="store_true",
+                        help="Wait for large visualization runs to be written before exiting; "
+                             "by default a detached process writes them after the CLI exits")
     parser.add_argument("--log-level", choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='INFO',
                         help="Set the logging level")
     parser.add_argument("--log-file", default="logs/tree_metrics.log",
@@ -28,6 +32,15 @@ def parse_arguments():
                         help="Visualize the point cloud in 3D using PyVista")
     parser.add_argument("--color-by", choices=['tree_id', 'classification', 'height'],
                         default='tree_id', help="Color points by this attribute")
+    parser.add_argument("--point-budget", type=int, default=config.LOD_POINT_BUDGET,
+                        help="Maximum number of points rendered in the 3D overview")
+    parser.add_argument("--tree-id", type=int, default=None,
+                        help="Render only this tree at full resolution")
+    parser.add_argument("--bbox", type=float, nargs=6, default=None,
+                        metavar=('XMIN', 'YMIN', 'ZMIN', 'XMAX', 'YMAX', 'ZMAX'),
+                        help="Render only points inside this bounding box at full resolution")
+    parser.add_argument("--screenshot", default=None,
+                        help="Render the 3D view off-screen and save it to this image file")
 
     return parser.parse_args()
 
@@ -42,26 +55,34 @@ def main():
     logger = logging.getLogger(__name__)
 
     try:
-        logger.info(f"Loading the point cloud from {args.input_file}")
+        logger.info("Loading the point cloud from %s", args.input_file)
         data = read_las_file(args.input_file)
 
-        metrics = process_point_cloud(data)
-
-        export_metrics_to_csv(metrics, args.output)
-        logger.info(f"Metrics exported to {args.output}")
+        stats = create_metric_stats()
+        metrics = process_point_cloud(data, stats)
 
         if args.visualize:
             output_dir = os.path.dirname(args.output)
-            create_metrics_summary(metrics, output_dir)
+            create_metrics_summary(metrics, output_dir, wait=False, stats=stats)
+
+        export_metrics_to_csv(metrics, args.output)
+        logger.info("Metrics exported to %s", args.output)
+
+        if args.wait_for_plots:
+            wait_for_plots()
 
-        if args.visualize_3d:
-            visualize_with_pyvista(data, args.color_by)
+        if args.visualize_3d or args.screenshot:
+            visualize_with_pyvista(data, args.color_by,
+                                   point_budget=args.point_budget,
+                                   tree_id=args.tree_id,
+                                   bbox=args.bbox,
+                                   screenshot=args.screenshot)
 
         logger.info("Processing completed successfully")
         return 0
 
     except Exception as e:
-        logger.error(f"Error processing the cloud points: {e}", exc_info=True)
+        logger.error("Error processing the cloud points: %s", e, exc_info=True)
         return 1
 
 
@@ -7,13 +7,22 @@ import config
 import numpy as np
 import logging
 import os
+import subprocess
+import sys
+import tempfile
 import pyvista as pv
-import matplotlib.pyplot as plt
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence
+
+from src.plots import write_metric_plots
+from src.lod import load_or_build_lod, select_lod_points, select_region
+from src.stats import StreamingStats, create_metric_stats
 
 logger = logging.getLogger(__name__)
 
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_plot_processes: List[subprocess.Popen] = []
+
 def export_metrics_to_csv(metrics: Dict[int, Dict[str, float]], output_path: str) -> None:
     """
     Export tree metrics to a CSV file.
@@ -33,63 +42,56 @@ def export_metrics_to_csv(metrics: Dict[int, Dict[str, float]], output_path: str
 
     df.to_csv(output_path, index=False)
 
-    logger.info(f"Exported metrics for {len(metrics)} trees to {output_path}")
+    logger.info("Exported metrics for %d trees to %s", len(metrics), output_path)
 
-def create_metrics_summary(metrics: Dict[int, Dict[str, float]], output_dir: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+def create_metrics_summary(metrics: Dict[int, Dict[str, float]], output_dir: Optional[str] = None,
+                           wait: bool = True,
+                           stats: Optional[Dict[str, StreamingStats]] = None) -> Dict[str, Dict[str, float]]:
     """
     Create a summary of tree metrics with statistics.
 
+    If stats accumulators are given (e.g. filled by process_point_cloud or merged
+    across tiles) they are used as-is; otherwise they are built from metrics.
+    If output_dir is given, metric plots are written there; see create_metric_visualizations.
+
     Returns:
         Dictionary with summary statistics
     """
-    heights = [m['height'] for m in metrics.values() if 'height' in m and m['height'] is not None]
-    dbhs = [m['dbh'] for m in metrics.values() if 'dbh' in m and m['dbh'] is not None]
-
-    summary = {
-        'height': {
-            'count': len(heights),
-            'min': min(heights) if heights else None,
-            'max': max(heights) if heights else None,
-            'mean': sum(heights) / len(heights) if heights else None,
-            'std': np.std(heights) if heights else None
-        },
-        'dbh': {
-            'count': len(dbhs),
-            'min': min(dbhs) if dbhs else None,
-            'max': max(dbhs) if dbhs else None,
-            'mean': sum(dbhs) / len(dbhs) if dbhs else None,
-            'std': np.std(dbhs) if dbhs else None
-        }
-    }
+    if stats is None:
+        stats = create_metric_stats()
+        for name, accumulator in stats.items():
+            accumulator.update_many([m.get(name) for m in metrics.values()])
+
+    summary = {name: accumulator.to_dict() for name, accumulator in stats.items()}
 
     logger.info("Tree metrics summary:")
-    if heights:
-        logger.info(f"Height (m): {len(heights)} trees, "
-                   f"min={summary['height']['min']:.2f}, "
-                   f"max={summary['height']['max']:.2f}, "
-                   f"mean={summary['height']['mean']:.2f}, "
-                   f"std={summary['height']['std']:.2f}")
-    else:
-        logger.info("Height (m): No valid height measurements")
-
-    if dbhs:
-        logger.info(f"DBH (m): {len(dbhs)} trees, "
-                   f"min={summary['dbh']['min']:.2f}, "
-                   f"max={summary['dbh']['max']:.2f}, "
-                   f"mean={summary['dbh']['mean']:.2f}, "
-                   f"std={summary['dbh']['std']:.2f}")
-    else:
-        logger.info("DBH (m): No valid DBH measurements")
-
-    if output_dir and (heights or dbhs):
-        create_metric_visualizations(metrics, output_dir)
+    for name, label, description in (('height', 'Height', 'height'), ('dbh', 'DBH', 'DBH')):
+        s = summary[name]
+        if s['count']:
+            logger.info("%s (m): %d trees, min=%.2f, max=%.2f, mean=%.2f, std=%.2f, median=%.2f",
+                        label, s['count'], s['min'], s['max'], s['mean'], s['std'], s['p50'])
+        else:
+            logger.info("%s (m): No valid %s measurements", label, description)
+
+    if output_dir and (summary['height']['count'] or summary['dbh']['count']):
+        create_metric_visualizations(metrics, output_dir, wait=wait)
 
     return summary
 
 
-def visualize_with_pyvista(data: Dict[str, Any], color_by: str = 'tree_id') -> None:
+def visualize_with_pyvista(data: Dict[str, Any], color_by: str = 'tree_id',
+                           point_budget: Optional[int] = config.LOD_POINT_BUDGET,
+                           tree_id: Optional[int] = None,
+                           bbox: Optional[Sequence[float]] = None,
+                           screenshot: Optional[str] = None,
+                           lod_cache_dir: Optional[str] = config.LOD_CACHE_DIR) -> None:
     """
     Visualize the point cloud using PyVista as mentioned in the assignment.
+
+    By default at most point_budget points are rendered, picked coarse-to-fine from a
+    cached LOD pyramid. Selecting a tree_id and/or bbox renders that region at full
+    resolution instead. When screenshot is given the scene is rendered off-screen and
+    saved to that path.
     """
     if 'xyz' not in data:
         logger.error("Cannot visualize: No point cloud data provided")
@@ -99,20 +101,35 @@ def visualize_with_pyvista(data: Dict[str, Any], color_by: str = 'tree_id') -> N
     try:
         xyz = data['xyz']
 
-        cloud = pv.PolyData(xyz)
+        if tree_id is not None or bbox is not None:
+            indices = select_region(data, tree_id, bbox)
+            logger.info("Rendering %d selected points at full resolution", len(indices))
+        elif point_budget is not None and len(xyz) > point_budget:
+            lod = load_or_build_lod(xyz, lod_cache_dir)
+            indices = select_lod_points(lod, point_budget)
+            logger.info("Rendering %d of %d points (LOD budget)", len(indices), len(xyz))
+        else:
+            indices = slice(None)
+
+        points = xyz[indices]
+        if len(points) == 0:
+            logger.warning("Cannot visualize: No points in the selected region")
+            return
+
+        cloud = pv.PolyData(points)
 
         if color_by == 'tree_id':
-            cloud["point_color"] = data['tree_id']
+            cloud["point_color"] = np.asarray(data['tree_id'])[indices]
             color_label = "Tree ID"
         elif color_by == 'classification':
-            cloud["point_color"] = data['classification']
+            cloud["point_color"] = np.asarray(data['classification'])[indices]
             color_label = "Classification"
         else:  # height (z-coordinate)
-            cloud["point_color"] = xyz[:, 2]
+            cloud["point_color"] = points[:, 2]
             color_label = "Height (m)"
 
-        logger.info(f"Visualizing point cloud colored by {color_label}...")
-        p = pv.Plotter()
+        logger.info("Visualizing point cloud colored by %s...", color_label)
+        p = pv.Plotter(off_screen=screenshot is not None)
         p.add_points(
             cloud,
             render_points_as_spheres=True,
@@ -121,66 +138,75 @@ def visualize_with_pyvista(data: Dict[str, Any], color_by: str = 'tree_id') -> N
             cmap=config.COLOR_MAP
         )
         p.add_scalar_bar(title=color_label)
-        p.show()
+
+        if screenshot:
+            screenshot_dir = os.path.dirname(screenshot)
+            if screenshot_dir:
+                os.makedirs(screenshot_dir, exist_ok=True)
+            p.show(screenshot=screenshot)
+            logger.info("Saved point cloud screenshot to %s", screenshot)
+        else:
+            p.show()
 
     except ImportError:
         logger.warning("PyVista is not installed. Skipping 3D visualization.")
         logger.info("Install PyVista with: pip install pyvista")
 
 
-def create_metric_visualizations(metrics: Dict[int, Dict[str, float]], output_dir: str) -> None:
+def _start_plot_writer(heights: np.ndarray, dbhs: np.ndarray, output_dir: str) -> None:
+    """
+    Hand the metric arrays to a detached `python -m src.plots` process.
+    """
+    fd, arrays_path = tempfile.mkstemp(prefix='tree_metrics_plots_', suffix='.npz')
+    os.close(fd)
+    np.savez(arrays_path, heights=heights, dbhs=dbhs)
+
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'src.plots', arrays_path, os.path.abspath(output_dir)],
+        cwd=_PROJECT_ROOT,
+        start_new_session=True
+    )
+    _plot_processes.append(process)
+
+
+def wait_for_plots() -> None:
+    """
+    Block until all metric plots handed to background writers have been written.
+    """
+    for process in _plot_processes:
+        if process.wait() != 0:
+            logger.error("Plot writer exited with status %d", process.returncode)
+    _plot_processes.clear()
+
+
+def create_metric_visualizations(metrics: Dict[int, Dict[str, float]], output_dir: str, wait: bool = True) -> None:
     """
     Create visualizations of tree metrics (histograms, scatter plots).
+
+    With wait=True, or up to PLOT_INLINE_MAX_TREES trees, the plots are drawn inline.
+    Otherwise they are written by a detached process that outlives the caller, so the
+    CLI can exit right after the CSV export; call wait_for_plots() to block on it.
+    The writer reports failed plots on stderr and through its exit status.
     """
     os.makedirs(output_dir, exist_ok=True)
 
-    tree_ids = list(metrics.keys())
-    heights = [metrics[tid].get('height') for tid in tree_ids]
-    dbhs = [metrics[tid].get('dbh') for tid in tree_ids]
+    heights = np.array([m.get('height') for m in metrics.values()], dtype=float)
+    dbhs = np.array([m.get('dbh') for m in metrics.values()], dtype=float)
 
-    valid_data = [(tid, h, d) for tid, h, d in zip(tree_ids, heights, dbhs)
-                  if h is not None and d is not None]
+    valid = ~np.isnan(heights) & ~np.isnan(dbhs)
 
-    if not valid_data:
+    if not np.any(valid):
         logger.warning("No valid data for visualization")
         return
 
-    tree_ids_valid, heights_valid, dbhs_valid = zip(*valid_data)
-
-    # 1. Height distribution histogram
-    plt.figure(figsize=(10, 6))
-    plt.hist(heights_valid, bins=10, edgecolor='black')
-    plt.title('Tree Height Distribution')
-    plt.xlabel('Height (m)')
-    plt.ylabel('Number of Trees')
-    plt.grid(True, alpha=0.3)
-    plt.savefig(os.path.join(output_dir, 'height_distribution.png'), dpi=300)
-    plt.close()
-
-    # 2. DBH distribution histogram
-    plt.figure(figsize=(10, 6))
-    plt.hist(dbhs_valid, bins=10, edgecolor='black')
-    plt.title('Tree DBH Distribution')
-    plt.xlabel('DBH (m)')
-    plt.ylabel('Number of Trees')
-    plt.grid(True, alpha=0.3)
-    plt.savefig(os.path.join(output_dir, 'dbh_distribution.png'), dpi=300)
-    plt.close()
-
-    # 3. Height vs DBH scatter plot
-    plt.figure(figsize=(10, 6))
-    plt.scatter(dbhs_valid, heights_valid, alpha=0.7)
-    plt.title('Tree Height vs DBH')
-    plt.xlabel('DBH (m)')
-    plt.ylabel('Height (m)')
-    plt.grid(True, alpha=0.3)
-
-    if len(valid_data) > 1:
-        z = np.polyfit(dbhs_valid, heights_valid, 1)
-        p = np.poly1d(z)
-        plt.plot(sorted(dbhs_valid), p(sorted(dbhs_valid)), "r--", alpha=0.8)
-
-    plt.savefig(os.path.join(output_dir, 'height_vs_dbh.png'), dpi=300)
-    plt.close()
-
-    logger.info(f"Created metric visualizations in {output_dir}")
\ No newline at end of file
+    heights_valid = heights[valid]
+    dbhs_valid = dbhs[valid]
+
+    if wait or len(heights_valid) <= config.PLOT_INLINE_MAX_TREES:
+        # Small runs: drawing is cheaper than starting a writer process
+        write_metric_plots(heights_valid, dbhs_valid, output_dir)
+        return
+
+    _start_plot_writer(heights_valid, dbhs_valid, output_dir)
+    logger.info("Writing metric visualizations for %d trees to %s in the background",
+                len(heights_valid), output_dir)
@@ -6,6 +6,8 @@ import numpy as np
 import laspy
 from typing import Dict, Any
 
+from src.preprocessing import build_tree_index
+
 
 logger = logging.getLogger(__name__)
 
@@ -20,16 +22,17 @@ def read_las_file(file_path: str) -> Dict[str, Any]:
         - 'tree_id': Tree IDs for each point
         - 'header': LAS file header information
         - 'point_count': Number of points in the file
+        - 'tree_index': Per-tree metadata index (see build_tree_index), or None
+          if no tree ID field was found
     """
-    logger.info(f"Reading las file: {file_path}")
+    logger.info("Reading las file: %s", file_path)
 
     try:
         with laspy.open(file_path) as fh:
             header = fh.header
             p_count = header.point_count
-            print(p_count)
 
-            logger.info(f"Found {p_count} points in the las file")
+            logger.info("Found %d points in the las file", p_count)
 
             points = fh.read()
 
@@ -38,7 +41,7 @@ def read_las_file(file_path: str) -> Dict[str, Any]:
             classification = points.classification
 
             available_attrs = [attr for attr in dir(points) if not attr.startswith('_')]
-            logger.debug(f"Available point attributes: {available_attrs}")
+            logger.debug("Available point attributes: %s", available_attrs)
 
             trees_id = None
             tree_id_fields = ["treeID", "tree_id", "TreeID", "tree_ID", "user_data", "point_source_id"]
@@ -46,7 +49,7 @@ def read_las_file(file_path: str) -> Dict[str, Any]:
             for field in tree_id_fields:
                 if hasattr(points, field):
                     trees_id = getattr(points, field)
-                    logger.info(f"Found tree ID data in field: {field}")
+                    logger.info("Found tree ID data in field: %s", field)
                     break
 
         data = {
@@ -54,22 +57,27 @@ def read_las_file(file_path: str) -> Dict[str, Any]:
             'classification': classification,
             'tree_id': trees_id,
             'header': header,
-            'point_count': p_count
+            'point_count': p_count,
+            'tree_index': build_tree_index(xyz, classification, trees_id) if trees_id is not None else None
         }
 
-        logger.info(f"Point cloud bounds: "
-                    f"X({min(xyz[:, 0]):.2f} to {max(xyz[:, 0]):.2f}), "
-                    f"Y({min(xyz[:, 1]):.2f} to {max(xyz[:, 1]):.2f}), "
-                    f"Z({min(xyz[:, 2]):.2f} to {max(xyz[:, 2]):.2f})")
-
-        unique_classes = np.unique(classification)
-        logger.info(f"Classification values: {unique_classes}")
-
-        unique_tree_id = np.unique(trees_id)
-        logger.info(f"Found unique tree {len(unique_tree_id)}")
+        if p_count:
+            bounds_min = xyz.min(axis=0)
+            bounds_max = xyz.max(axis=0)
+            logger.info("Point cloud bounds: X(%.2f to %.2f), Y(%.2f to %.2f), Z(%.2f to %.2f)",
+                        bounds_min[0], bounds_max[0],
+                        bounds_min[1], bounds_max[1],
+                        bounds_min[2], bounds_max[2])
+
+        tree_index = data['tree_index']
+        if tree_index is not None:
+            logger.info("Classification values: %s", tree_index['classes'])
+            logger.info("Found unique tree %d", len(tree_index['tree_ids']))
+        else:
+            logger.info("Classification values: %s", np.unique(classification))
 
         return data
 
     except Exception as e:
-        logger.error(f"Error reading LAS file: {e}")
+        logger.error("Error reading LAS file: %s", e)
         raise
@@ -0,0 +1,157 @@
+"""
+Level-of-detail (LOD) helpers for rendering large point clouds.
+"""
+
+import hashlib
+import logging
+import os
+import numpy as np
+from typing import Dict, Optional, Sequence
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Grid coordinates of each axis are packed into a single int64 key,
+# so each axis may use at most 21 bits.
+MAX_LOD_LEVELS = 20
+
+# Fixed seed for shuffling within levels, so cached pyramids stay deterministic
+LOD_SHUFFLE_SEED = 0
+# Bumped whenever the pyramid layout changes, to invalidate old caches
+LOD_CACHE_VERSION = 2
+
+
+def build_lod_pyramid(xyz: np.ndarray, max_levels: int = config.LOD_MAX_LEVELS) -> Dict[str, np.ndarray]:
+    """
+    Build a multi-resolution voxel pyramid of a point cloud.
+
+    Level L splits the cloud's bounding box into 2**L voxels per axis and keeps one
+    representative point per occupied voxel that was not already picked by a coarser
+    level. Points left over after the finest level are appended at the end. Each
+    level is shuffled with a fixed seed, so a budget cut in the middle of a level
+    still covers the whole extent regardless of the file's point order.
+
+    Returns:
+        Dictionary with:
+        - 'order': Point indices ordered from coarse to fine
+        - 'level_offsets': Start offset of each level in 'order', plus the total count
+    """
+    max_levels = min(max_levels, MAX_LOD_LEVELS)
+    n_points = len(xyz)
+
+    mins = xyz.min(axis=0) if n_points else np.zeros(3)
+    extent = (xyz.max(axis=0) - mins) if n_points else np.zeros(3)
+    extent = np.where(extent > 0, extent, 1.0)
+    normalized = (xyz - mins) / extent
+
+    rng = np.random.default_rng(LOD_SHUFFLE_SEED)
+    remaining = np.arange(n_points)
+    chunks = []
+    level_offsets = [0]
+
+    for level in range(max_levels + 1):
+        if len(remaining) == 0:
+            break
+
+        cells = 2 ** level
+        grid = np.minimum((normalized[remaining] * cells).astype(np.int64), cells - 1)
+        keys = (grid[:, 0] << 42) | (grid[:, 1] << 21) | grid[:, 2]
+
+        _, first = np.unique(keys, return_index=True)
+        picked = np.zeros(len(remaining), dtype=bool)
+        picked[first] = True
+
+        chunks.append(rng.permutation(remaining[picked]))
+        remaining = remaining[~picked]
+        level_offsets.append(level_offsets[-1] + len(chunks[-1]))
+
+    if len(remaining):
+        chunks.append(rng.permutation(remaining))
+        level_offsets.append(level_offsets[-1] + len(remaining))
+
+    order = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+    logger.debug("Built LOD pyramid with %d levels for %d points", len(level_offsets) - 1, n_points)
+
+    return {
+        'order': order,
+        'level_offsets': np.asarray(level_offsets, dtype=np.int64)
+    }
+
+
+def _cloud_fingerprint(xyz: np.ndarray, max_levels: int) -> str:
+    """
+    Hash the coordinates so a cached pyramid is only reused for the same cloud.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(xyz, dtype=np.float64).data)
+    digest.update(f"{max_levels}:{LOD_CACHE_VERSION}".encode())
+    return digest.hexdigest()
+
+
+def load_or_build_lod(xyz: np.ndarray, cache_dir: Optional[str] = config.LOD_CACHE_DIR,
+                      max_levels: int = config.LOD_MAX_LEVELS) -> Dict[str, np.ndarray]:
+    """
+    Load the LOD pyramid for a point cloud from the on-disk cache, building it if missing.
+
+    Returns:
+        LOD pyramid as returned by build_lod_pyramid
+    """
+    if not cache_dir:
+        return build_lod_pyramid(xyz, max_levels)
+
+    cache_path = os.path.join(cache_dir, f"{_cloud_fingerprint(xyz, max_levels)}.npz")
+
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path) as cached:
+                logger.info("Loaded LOD pyramid from %s", cache_path)
+                return {'order': cached['order'], 'level_offsets': cached['level_offsets']}
+        except Exception as e:
+            logger.warning("Ignoring unreadable LOD cache %s: %s", cache_path, e)
+
+    lod = build_lod_pyramid(xyz, max_levels)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(cache_path, order=lod['order'], level_offsets=lod['level_offsets'])
+        logger.info("Cached LOD pyramid to %s", cache_path)
+    except OSError as e:
+        logger.warning("Could not write LOD cache %s: %s", cache_path, e)
+
+    return lod
+
+
+def select_lod_points(lod: Dict[str, np.ndarray], point_budget: int) -> np.ndarray:
+    """
+    Pick at most point_budget points, coarse levels first.
+
+    Returns:
+        Indices of the points to render
+    """
+    return lod['order'][:max(point_budget, 0)]
+
+
+def select_region(data: Dict[str, np.ndarray], tree_id: Optional[int] = None,
+                  bbox: Optional[Sequence[float]] = None) -> np.ndarray:
+    """
+    Select points of a single tree and/or inside a bounding box.
+
+    The bounding box is given as (xmin, ymin, zmin, xmax, ymax, zmax).
+
+    Returns:
+        Indices of the selected points
+    """
+    xyz = data['xyz']
+    mask = np.ones(len(xyz), dtype=bool)
+
+    if tree_id is not None:
+        mask &= np.asarray(data['tree_id']) == tree_id
+
+    if bbox is not None:
+        lower = np.asarray(bbox[:3])
+        upper = np.asarray(bbox[3:])
+        mask &= np.all((xyz >= lower) & (xyz <= upper), axis=1)
+
+    return np.flatnonzero(mask)
@@ -1,26 +1,140 @@
+import atexit
+import copy
 import logging
+import logging.handlers
+import multiprocessing
 import os
-from typing import Optional
+import queue
+from typing import List, Optional
+
+_log_queue: Optional[queue.SimpleQueue] = None
+_worker_log_queue = None
+_log_listeners: List[logging.handlers.QueueListener] = []
+_log_handlers: List[logging.Handler] = []
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The message arguments are merged when the record is enqueued, so later changes
+    to logged objects do not show up in the log and records can be pickled across
+    processes. Timestamps, level names and layout are formatted by the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if self.queue is _log_queue:
+            record.msg = record.getMessage()
+            record.args = None
+            return record
+
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 
 def setup_logging(log_file: Optional[str] ='tree_metrics.log', log_level: str ='INFO'):
     """
     Configure the application's logging system.
+
+    Log calls only put records on a queue; a background listener thread formats them
+    and writes to the console and log file. A multiprocessing queue and its listener
+    are only created once a worker process needs them: forked workers are switched to
+    it automatically, spawned workers can pass get_worker_log_queue() to
+    configure_worker_logging in their pool initializer.
     """
+    global _log_queue
 
     log_dir = os.path.dirname(log_file)
     if log_dir and not os.path.exists(log_dir):
         os.makedirs(log_dir, exist_ok=True)
 
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),  # Console output
-            logging.FileHandler(log_file)  # File output
-        ]
-    )
+    stop_logging()
 
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.StreamHandler(),  # Console output
+        logging.FileHandler(log_file)  # File output
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    _log_handlers[:] = handlers
+    _log_queue = queue.SimpleQueue()
+    _start_listener(_log_queue)
+
+    configure_worker_logging(_log_queue, log_level)
 
     logger = logging.getLogger(__name__)
-    logger.debug(f"Logging configured: level={log_level}, file={log_file}")
\ No newline at end of file
+    logger.debug("Logging configured: level=%s, file=%s", log_level, log_file)
+
+
+def configure_worker_logging(log_queue, log_level: str = 'INFO') -> None:
+    """
+    Route this process's log records to the given queue (e.g. in a pool initializer).
+    """
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    root.setLevel(getattr(logging, log_level))
+
+
+def get_worker_log_queue():
+    """
+    Return the multiprocessing queue for worker process logs, creating it on first use.
+
+    Returns:
+        The queue, or None if logging is not configured
+    """
+    global _worker_log_queue
+
+    if _worker_log_queue is None and _log_listeners:
+        _worker_log_queue = multiprocessing.Queue(-1)
+        _start_listener(_worker_log_queue)
+    return _worker_log_queue
+
+
+def _start_listener(log_queue) -> None:
+    listener = logging.handlers.QueueListener(log_queue, *_log_handlers, respect_handler_level=True)
+    listener.start()
+    _log_listeners.append(listener)
+
+
+def stop_logging() -> None:
+    """
+    Flush queued records and stop the logging listeners.
+    """
+    global _worker_log_queue
+
+    handlers = set()
+    while _log_listeners:
+        listener = _log_listeners.pop()
+        listener.stop()
+        handlers.update(listener.handlers)
+
+    for handler in handlers:
+        handler.close()
+    _worker_log_queue = None
+
+
+def _create_worker_queue_before_fork() -> None:
+    # Make sure a forked child has a queue the parent is listening on
+    if _log_listeners:
+        get_worker_log_queue()
+
+
+def _use_worker_queue_after_fork() -> None:
+    # The in-process queue has no listener in a forked child
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _DeferredQueueHandler) and handler.queue is _log_queue:
+            handler.queue = _worker_log_queue
+    _log_listeners.clear()
+
+
+os.register_at_fork(before=_create_worker_queue_before_fork, after_in_child=_use_worker_queue_after_fork)
+atexit.register(stop_logging)
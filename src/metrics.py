@@ -25,7 +25,7 @@ def calculate_tree_height(tree_data: Dict[str, np.ndarray]) -> float:
     max_z = np.max(z_cord)
 
     height = max_z - min_z
-    logger.info(f"Calculated tree height: {height:.3f}m")
+    logger.debug("Calculated tree height: %.3fm", height)
 
     # pprint.pp(tree_data)
     return height
@@ -54,7 +54,7 @@ def calculate_dbh(tree_data: Dict[str, np.ndarray]) -> Optional[float]:
         )
 
         if len(dbh_slice) < config.DBH_MIN_POINTS:
-            logger.warning(f"Not enough points at breast height: {len(dbh_slice)} < {config.DBH_MIN_POINTS}")
+            logger.warning("Not enough points at breast height: %d < %d", len(dbh_slice), config.DBH_MIN_POINTS)
             return None
 
         max_distance = 0.0
@@ -69,7 +69,7 @@ def calculate_dbh(tree_data: Dict[str, np.ndarray]) -> Optional[float]:
                     max_distance = float(dist)
 
         if max_distance > 0:
-            logger.info(f"Calculated DBH: {max_distance:.3f}m")
+            logger.debug("Calculated DBH: %.3fm", max_distance)
             return float(max_distance)
         else:
             logger.warning("Could not determine DBH - no valid distances found")
@@ -77,7 +77,7 @@ def calculate_dbh(tree_data: Dict[str, np.ndarray]) -> Optional[float]:
 
 
     except Exception as e:
-        logger.error(f"Error calculating DBH: {e}")
+        logger.error("Error calculating DBH: %s", e)
         return None
 
 
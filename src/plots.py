@@ -0,0 +1,125 @@
+"""
+Drawing of tree metric plots.
+
+Kept free of heavy imports (only numpy and matplotlib) so that the background
+plot writer (python -m src.plots) starts quickly. Figures are created without pyplot, so no GUI backend or
+global figure state is involved.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import numpy as np
+from matplotlib.figure import Figure
+from typing import List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def plot_histogram(counts: np.ndarray, edges: np.ndarray, title: str, xlabel: str, output_path: str) -> str:
+    """
+    Draw a histogram from precomputed bin counts.
+    """
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', edgecolor='black')
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Number of Trees')
+    ax.grid(True, alpha=0.3)
+    fig.savefig(output_path, dpi=config.PLOT_DPI)
+    return output_path
+
+
+def plot_height_vs_dbh(dbhs: np.ndarray, heights: np.ndarray, output_path: str) -> str:
+    """
+    Draw height against DBH, as a hexbin density plot for large tree counts.
+    """
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+
+    if len(dbhs) > config.PLOT_HEXBIN_THRESHOLD:
+        hb = ax.hexbin(dbhs, heights, gridsize=100, bins='log', mincnt=1, cmap='viridis')
+        fig.colorbar(hb, ax=ax, label='Number of Trees')
+    else:
+        ax.scatter(dbhs, heights, alpha=0.7)
+
+    ax.set_title('Tree Height vs DBH')
+    ax.set_xlabel('DBH (m)')
+    ax.set_ylabel('Height (m)')
+    ax.grid(True, alpha=0.3)
+
+    if len(dbhs) > 1:
+        z = np.polyfit(dbhs, heights, 1)
+        p = np.poly1d(z)
+        x_range = np.array([dbhs.min(), dbhs.max()])
+        ax.plot(x_range, p(x_range), "r--", alpha=0.8)
+
+    fig.savefig(output_path, dpi=config.PLOT_DPI)
+    return output_path
+
+
+def write_metric_plots(heights: np.ndarray, dbhs: np.ndarray, output_dir: str) -> List[str]:
+    """
+    Write the height and DBH histograms and the height vs DBH plot.
+
+    A failing plot is logged and does not stop the others.
+
+    Returns:
+        Paths of the plots that could not be written
+    """
+    height_counts, height_edges = np.histogram(heights, bins=config.PLOT_HISTOGRAM_BINS)
+    dbh_counts, dbh_edges = np.histogram(dbhs, bins=config.PLOT_HISTOGRAM_BINS)
+
+    jobs = [
+        # 1. Height distribution histogram
+        (plot_histogram, (height_counts, height_edges, 'Tree Height Distribution', 'Height (m)'),
+         os.path.join(output_dir, 'height_distribution.png')),
+        # 2. DBH distribution histogram
+        (plot_histogram, (dbh_counts, dbh_edges, 'Tree DBH Distribution', 'DBH (m)'),
+         os.path.join(output_dir, 'dbh_distribution.png')),
+        # 3. Height vs DBH scatter plot
+        (plot_height_vs_dbh, (dbhs, heights), os.path.join(output_dir, 'height_vs_dbh.png')),
+    ]
+
+    failed = []
+    for plot, args, output_path in jobs:
+        try:
+            plot(*args, output_path)
+            logger.info("Created plot %s", output_path)
+        except Exception as e:
+            logger.error("Error creating plot %s: %s", output_path, e)
+            failed.append(output_path)
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Write metric plots from an .npz of 'heights' and 'dbhs' arrays, then delete it.
+
+    Run as a detached process by create_metric_visualizations:
+        python -m src.plots <arrays.npz> <output_dir>
+    """
+    parser = argparse.ArgumentParser(description="Write tree metric plots")
+    parser.add_argument("arrays", help="Path to the .npz file with 'heights' and 'dbhs'")
+    parser.add_argument("output_dir", help="Directory for the plot images")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    try:
+        with np.load(args.arrays) as arrays:
+            heights = arrays['heights']
+            dbhs = arrays['dbhs']
+    finally:
+        os.remove(args.arrays)
+
+    failed = write_metric_plots(heights, dbhs, args.output_dir)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,39 +6,114 @@ import numpy as np
 import logging
 from typing import Dict, Any
 
+import config
+
 logger = logging.getLogger(__name__)
 
+def build_tree_index(xyz: np.ndarray, classification: np.ndarray, tree_id: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Build a per-tree metadata index in one vectorized pass over the points.
+
+    Returns:
+        Dictionary with, per tree ID (ascending, including 0 = non-tree points):
+        - 'tree_ids': Tree IDs
+        - 'order': Point indices sorted by tree ID; a tree's points are
+          order[offsets[i]:offsets[i] + point_counts[i]]
+        - 'offsets': Start of each tree in 'order'
+        - 'point_counts': Number of points
+        - 'bbox_min', 'bbox_max': Bounding box corners (n_trees, 3), Z range included
+        - 'classes': Classification values present in the file
+        - 'class_counts': Points per classification value (n_trees, n_classes)
+        - 'dbh_points': Trunk points within DBH_TOLERANCE of DBH_HEIGHT
+    """
+    tree_id = np.asarray(tree_id)
+    classification = np.asarray(classification)
+
+    order = np.argsort(tree_id, kind='stable')
+    tree_ids, offsets, point_counts = np.unique(tree_id[order], return_index=True, return_counts=True)
+    classes = np.unique(classification)
+
+    if len(tree_ids) == 0:
+        return {
+            'tree_ids': tree_ids,
+            'order': order,
+            'offsets': offsets,
+            'point_counts': point_counts,
+            'bbox_min': np.empty((0, 3)),
+            'bbox_max': np.empty((0, 3)),
+            'classes': classes,
+            'class_counts': np.empty((0, len(classes)), dtype=np.int64),
+            'dbh_points': np.empty(0, dtype=np.int64)
+        }
+
+    sorted_xyz = xyz[order]
+    sorted_classification = classification[order]
+
+    bbox_min = np.minimum.reduceat(sorted_xyz, offsets, axis=0)
+    bbox_max = np.maximum.reduceat(sorted_xyz, offsets, axis=0)
+
+    tree_pos = np.repeat(np.arange(len(tree_ids)), point_counts)
+    class_pos = np.searchsorted(classes, sorted_classification)
+    class_counts = np.bincount(tree_pos * len(classes) + class_pos,
+                               minlength=len(tree_ids) * len(classes)).reshape(len(tree_ids), len(classes))
+
+    z = sorted_xyz[:, 2]
+    at_dbh = ((sorted_classification == config.TRUNK_CLASS) &
+              (z >= config.DBH_HEIGHT - config.DBH_TOLERANCE) &
+              (z <= config.DBH_HEIGHT + config.DBH_TOLERANCE))
+    dbh_points = np.add.reduceat(at_dbh.astype(np.int64), offsets)
+
+    return {
+        'tree_ids': tree_ids,
+        'order': order,
+        'offsets': offsets,
+        'point_counts': point_counts,
+        'bbox_min': bbox_min,
+        'bbox_max': bbox_max,
+        'classes': classes,
+        'class_counts': class_counts,
+        'dbh_points': dbh_points
+    }
+
+
 def group_points_by_trees(data: Dict[str,Any]) -> Dict[int, Dict[str, np.ndarray]]:
     """
     Group points by tree ID.
 
+    Uses data['tree_index'] when present (see read_las_file), otherwise builds it.
+
     Returns:
        Dictionary with tree IDs as keys, and for each tree ID, a dictionary with:
        - 'xyz': Points belonging to this tree
        - 'classification': Classifications of these points
+       - 'dbh_points': Number of trunk points at breast height
    """
     xyz = data['xyz']
     classification = data['classification']
-    tree_id = data['tree_id']
 
-    unique_tree_ids = np.unique(tree_id)
-    unique_tree_ids = unique_tree_ids[unique_tree_ids > 0]
+    index = data.get('tree_index')
+    if index is None:
+        index = build_tree_index(xyz, classification, data['tree_id'])
 
-    logger.info(f"Found {len(unique_tree_ids)} unique trees in the point cloud")
+    order = index['order']
+    is_tree = index['tree_ids'] > 0
 
-    trees = {}
-    for tid in unique_tree_ids:
-        tree_mask = tree_id == tid
+    logger.info("Found %d unique trees in the point cloud", np.count_nonzero(is_tree))
 
-        tree_xyz = xyz[tree_mask]
-        tree_classification = classification[tree_mask]
+    trees = {}
+    for tid, start, count, dbh_points in zip(index['tree_ids'][is_tree].tolist(),
+                                             index['offsets'][is_tree].tolist(),
+                                             index['point_counts'][is_tree].tolist(),
+                                             index['dbh_points'][is_tree].tolist()):
+        tree_points = order[start:start + count]
 
         trees[int(tid)] = {
-            'xyz': tree_xyz,
-            'classification': tree_classification
+            'xyz': xyz[tree_points],
+            'classification': classification[tree_points],
+            'dbh_points': dbh_points
         }
 
-        logger.debug(f"Tree {tid}: {len(tree_xyz)} points")
+        logger.debug("Tree %d: %d points", tid, count)
     return trees
 
 def get_points_at_height(
@@ -3,49 +3,87 @@ Processing pipeline for LiDAR point cloud data.
 """
 
 import logging
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, Optional
+
+import config
 from .preprocessing import group_points_by_trees
 from .metrics import calculate_tree_height, calculate_dbh
+from .stats import StreamingStats
 
 logger = logging.getLogger(__name__)
 
-def process_point_cloud(data: Dict[str, Any]) -> Dict[int, Dict[str, float]]:
+def process_point_cloud(data: Dict[str, Any],
+                        stats: Optional[Dict[str, StreamingStats]] = None) -> Dict[int, Dict[str, float]]:
     """
     Process tje point data to calculate tree metrics
 
+    If stats is given (see create_metric_stats), each metric is added to its
+    accumulator as soon as the tree is processed.
+
     Returns:
         Dictionary with tree metrics (height, dbh) for each tree ID
     """
 
     logger.info("Grouping points by tree ID")
     trees = group_points_by_trees(data)
-    logger.info(f"Processing {len(trees)} trees")
+
+    return process_trees(trees, stats)
+
+
+def process_trees(trees: Dict[int, Dict[str, np.ndarray]],
+                  stats: Optional[Dict[str, StreamingStats]] = None) -> Dict[int, Dict[str, float]]:
+    """
+    Calculate tree metrics for trees already grouped by group_points_by_trees.
+
+    Returns:
+        Dictionary with tree metrics (height, dbh) for each tree ID
+    """
+    logger.info("Processing %d trees", len(trees))
 
     metrics = {}
+    skipped_dbh = 0
     for tree_id, tree_data in trees.items():
-        logger.info(f"Processing tree {tree_id}")
+        logger.debug("Processing tree %d", tree_id)
 
         # Height Calculation
         try:
             height = calculate_tree_height(tree_data)
-            logger.info(f"Tree {tree_id} height: {height:.3f}m")
+            logger.debug("Tree %d height: %.3fm", tree_id, height)
         except Exception as e:
-            logger.error(f"Error calculating height for tree {tree_id}: {e}")
+            logger.error("Error calculating height for tree %d: %s", tree_id, e)
             height = None
 
-        # DBH Calculation
-        try:
-            dbh = calculate_dbh(tree_data)
-            logger.info(f"Tree {tree_id} DBH: {dbh:.3f}m")
-        except Exception as e:
-            logger.error(f"Error calculating DBH for tree {tree_id}: {e}")
+        # DBH Calculation, skipped when the index shows too few breast-height points
+        dbh_points = tree_data.get('dbh_points')
+        if dbh_points is not None and dbh_points < config.DBH_MIN_POINTS:
+            logger.debug("Not enough points at breast height for tree %d: %d < %d",
+                         tree_id, dbh_points, config.DBH_MIN_POINTS)
+            skipped_dbh += 1
             dbh = None
+        else:
+            try:
+                dbh = calculate_dbh(tree_data)
+                if dbh is not None:
+                    logger.debug("Tree %d DBH: %.3fm", tree_id, dbh)
+            except Exception as e:
+                logger.error("Error calculating DBH for tree %d: %s", tree_id, e)
+                dbh = None
 
         metrics[tree_id] = {
             'height': height,
             'dbh': dbh
         }
 
+        if stats is not None:
+            for name, value in metrics[tree_id].items():
+                if name in stats and value is not None:
+                    stats[name].update(value)
+
+    if skipped_dbh:
+        logger.warning("Skipped DBH for %d of %d trees with fewer than %d trunk points at breast height",
+                       skipped_dbh, len(trees), config.DBH_MIN_POINTS)
+
     return metrics
 
 
@@ -0,0 +1,217 @@
+"""
+Mergeable streaming statistics for tree metrics.
+"""
+
+import math
+import numpy as np
+from typing import Dict, Iterable, Optional
+
+import config
+
+
+class StreamingStats:
+    """
+    Constant-memory summary of a stream of values.
+
+    Tracks count, min, max, mean and variance (Welford) exactly, and quantiles
+    approximately with a log-bucketed histogram sketch whose estimates are within
+    relative_accuracy of the true value. Two instances built over different trees,
+    workers or tiles can be combined with merge().
+    """
+
+    def __init__(self, relative_accuracy: float = config.SUMMARY_QUANTILE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        self._m2 = 0.0
+
+        # Histogram sketch: bucket index -> count, for positive and negative values
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self._zero_count = 0
+
+    def update(self, value: float) -> None:
+        """
+        Add a single value; None and non-finite values (NaN, +/-inf) are ignored.
+        """
+        if value is None:
+            return
+        value = float(value)
+        if not math.isfinite(value):
+            return
+
+        # Welford update
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value > 0:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self._positive[key] = self._positive.get(key, 0) + 1
+        elif value < 0:
+            key = math.ceil(math.log(-value) / self._log_gamma)
+            self._negative[key] = self._negative.get(key, 0) + 1
+        else:
+            self._zero_count += 1
+
+    def update_many(self, values: Iterable[float]) -> None:
+        """
+        Add a batch of values; None and non-finite entries (NaN, +/-inf) are ignored.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+
+        batch_count = len(values)
+        batch_mean = float(np.mean(values))
+        batch_m2 = float(np.sum((values - batch_mean) ** 2))
+        self._combine_moments(batch_count, batch_mean, batch_m2)
+
+        self.min = min(self.min, float(np.min(values)))
+        self.max = max(self.max, float(np.max(values)))
+
+        self._zero_count += int(np.sum(values == 0))
+        self._add_to_store(self._positive, values[values > 0])
+        self._add_to_store(self._negative, -values[values < 0])
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        """
+        Fold another accumulator into this one.
+
+        Returns:
+            This accumulator
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge statistics with different relative accuracy")
+
+        if other.count == 0:
+            return self
+
+        self._combine_moments(other.count, other.mean, other._m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        self._zero_count += other._zero_count
+        for store, other_store in ((self._positive, other._positive), (self._negative, other._negative)):
+            for key, bucket_count in other_store.items():
+                store[key] = store.get(key, 0) + bucket_count
+
+        return self
+
+    @property
+    def variance(self) -> Optional[float]:
+        """
+        Population variance, or None if no values were added.
+        """
+        return self._m2 / self.count if self.count else None
+
+    @property
+    def std(self) -> Optional[float]:
+        """
+        Population standard deviation, or None if no values were added.
+        """
+        return math.sqrt(self.variance) if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Approximate the q-th quantile (0 <= q <= 1).
+
+        Like NumPy's default (linear) method, interpolates between the values at the
+        two ranks adjacent to q * (count - 1).
+
+        Returns:
+            Quantile estimate, or None if no values were added
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        lower = math.floor(rank)
+        lower_value = self._value_at_rank(lower)
+        if rank == lower:
+            return lower_value
+
+        upper_value = self._value_at_rank(lower + 1)
+        return lower_value + (upper_value - lower_value) * (rank - lower)
+
+    def to_dict(self, percentiles: Iterable[float] = config.SUMMARY_PERCENTILES) -> Dict[str, Optional[float]]:
+        """
+        Summarize the accumulated values.
+
+        Returns:
+            Dictionary with count, min, max, mean, std and a 'p<N>' entry per percentile
+        """
+        summary = {
+            'count': self.count,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'mean': self.mean if self.count else None,
+            'std': self.std
+        }
+        for p in percentiles:
+            summary[f"p{p:g}"] = self.quantile(p / 100)
+        return summary
+
+    def _combine_moments(self, count: int, mean: float, m2: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def _add_to_store(self, store: Dict[int, int], values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+        keys = np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        for key, bucket_count in zip(unique_keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + bucket_count
+
+    def _value_at_rank(self, rank: int) -> float:
+        # The smallest and largest values are tracked exactly
+        if rank <= 0:
+            return self.min
+        if rank >= self.count - 1:
+            return self.max
+
+        seen = 0
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return self._clamp(-self._bucket_value(key))
+
+        seen += self._zero_count
+        if seen > rank:
+            return self._clamp(0.0)
+
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._clamp(self._bucket_value(key))
+
+        return self.max
+
+    def _bucket_value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def _clamp(self, value: float) -> float:
+        return min(max(value, self.min), self.max)
+
+
+def create_metric_stats() -> Dict[str, StreamingStats]:
+    """
+    Create empty accumulators for each exported tree metric.
+    """
+    return {'height': StreamingStats(), 'dbh': StreamingStats()}
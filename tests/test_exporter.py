@@ -1,9 +1,12 @@
 """
 Tests for the exporter functions.
 """
+import logging
 import os
 import pandas as pd
-from src.exporter import export_metrics_to_csv
+import pytest
+import config
+from src.exporter import export_metrics_to_csv, create_metric_visualizations, create_metrics_summary, wait_for_plots
 
 
 def test_export_metrics_to_csv(tmp_path):
@@ -26,4 +29,48 @@ def test_export_metrics_to_csv(tmp_path):
 
     tree1 = df[df['tree_id'] == 1].iloc[0]
     assert tree1['height'] == 10.5
-    assert tree1['dbh'] == 0.35
\ No newline at end of file
+    assert tree1['dbh'] == 0.35
+
+def test_create_metric_visualizations(tmp_path):
+    """Test that inline plotting writes all metric plots."""
+    metrics = {
+        1: {'height': 10.5, 'dbh': 0.35},
+        2: {'height': 15.2, 'dbh': 0.42},
+        3: {'height': 12.1, 'dbh': None}
+    }
+
+    create_metric_visualizations(metrics, str(tmp_path), wait=False)
+
+    for name in ['height_distribution.png', 'dbh_distribution.png', 'height_vs_dbh.png']:
+        assert os.path.exists(tmp_path / name)
+
+
+def test_create_metric_visualizations_background(tmp_path, monkeypatch):
+    """Test that the detached plot writer writes all metric plots."""
+    monkeypatch.setattr(config, 'PLOT_INLINE_MAX_TREES', 0)
+    metrics = {
+        1: {'height': 10.5, 'dbh': 0.35},
+        2: {'height': 15.2, 'dbh': 0.42}
+    }
+
+    create_metric_visualizations(metrics, str(tmp_path), wait=False)
+    wait_for_plots()
+
+    for name in ['height_distribution.png', 'dbh_distribution.png', 'height_vs_dbh.png']:
+        assert os.path.exists(tmp_path / name)
+
+
+def test_create_metric_visualizations_logs_failures(tmp_path, caplog):
+    """Test that a failed plot is logged without stopping the others."""
+    metrics = {
+        1: {'height': 10.5, 'dbh': 0.35},
+        2: {'height': 15.2, 'dbh': 0.42}
+    }
+    # A directory in place of the image makes savefig fail
+    (tmp_path / 'height_vs_dbh.png').mkdir()
+
+    with caplog.at_level(logging.ERROR):
+        create_metric_visualizations(metrics, str(tmp_path))
+
+    assert "Error creating plot" in caplog.text
+    assert os.path.exists(tmp_path / 'height_distribution.png')
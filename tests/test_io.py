@@ -1,6 +1,7 @@
 """
 Tests for the I/O functions.
 """
+import logging
 import numpy as np
 from unittest.mock import patch, MagicMock
 from src.io import read_las_file
@@ -39,4 +40,28 @@ def test_read_las_file_mock():
     assert 'classification' in result
     assert 'tree_id' in result
     assert result['point_count'] == 100
-    assert result['xyz'].shape == (100, 3)
\ No newline at end of file
+    assert result['xyz'].shape == (100, 3)
+    assert list(result['tree_index']['tree_ids']) == [0, 1, 2, 3]
+    assert list(result['tree_index']['point_counts']) == [25, 25, 25, 25]
+
+
+def test_read_las_file_without_tree_ids(caplog):
+    """Test that classification values are logged even without a tree ID field."""
+    with patch('laspy.open') as mock_open:
+        mock_file = MagicMock()
+        mock_open.return_value.__enter__.return_value = mock_file
+        mock_file.header.point_count = 4
+
+        mock_points = MagicMock(spec=['x', 'y', 'z', 'classification'])
+        mock_points.x = np.array([1.0, 2.0, 3.0, 4.0])
+        mock_points.y = np.array([5.0, 6.0, 7.0, 8.0])
+        mock_points.z = np.array([0.0, 1.0, 2.0, 3.0])
+        mock_points.classification = np.array([0, 1, 1, 3])
+        mock_file.read.return_value = mock_points
+
+        with caplog.at_level(logging.INFO):
+            result = read_las_file('fake_file.las')
+
+    assert result['tree_id'] is None
+    assert result['tree_index'] is None
+    assert "Classification values: [0 1 3]" in caplog.text
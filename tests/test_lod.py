@@ -0,0 +1,73 @@
+"""
+Tests for the level-of-detail helpers.
+"""
+import os
+import numpy as np
+from src.lod import build_lod_pyramid, load_or_build_lod, select_lod_points, select_region
+
+
+def test_build_lod_pyramid_orders_every_point_once():
+    """Test that the pyramid is a permutation of all points, coarse levels first."""
+    rng = np.random.default_rng(0)
+    xyz = rng.uniform(0, 10, size=(1000, 3))
+
+    lod = build_lod_pyramid(xyz, max_levels=4)
+
+    assert np.array_equal(np.sort(lod['order']), np.arange(1000))
+    assert lod['level_offsets'][0] == 0
+    assert lod['level_offsets'][-1] == 1000
+    # Level 0 keeps a single representative for the whole bounding box
+    assert lod['level_offsets'][1] == 1
+
+
+def test_select_lod_points_respects_budget():
+    """Test that the budgeted selection never exceeds the point budget."""
+    rng = np.random.default_rng(1)
+    xyz = rng.uniform(0, 10, size=(500, 3))
+    lod = build_lod_pyramid(xyz, max_levels=3)
+
+    assert len(select_lod_points(lod, 100)) == 100
+    assert len(select_lod_points(lod, 1000)) == 500
+
+
+def test_load_or_build_lod_uses_cache(tmp_path):
+    """Test that the pyramid is written to and read back from the cache."""
+    rng = np.random.default_rng(2)
+    xyz = rng.uniform(0, 10, size=(200, 3))
+
+    built = load_or_build_lod(xyz, str(tmp_path), max_levels=3)
+    assert len(os.listdir(tmp_path)) == 1
+
+    cached = load_or_build_lod(xyz, str(tmp_path), max_levels=3)
+    assert np.array_equal(built['order'], cached['order'])
+    assert np.array_equal(built['level_offsets'], cached['level_offsets'])
+
+
+def test_select_region():
+    """Test selecting points by tree ID and bounding box."""
+    data = {
+        'xyz': np.array([
+            [0, 0, 0],
+            [1, 1, 1],
+            [2, 2, 2],
+            [3, 3, 3],
+        ], dtype=float),
+        'tree_id': np.array([1, 1, 2, 2])
+    }
+
+    assert list(select_region(data, tree_id=2)) == [2, 3]
+    assert list(select_region(data, bbox=(0.5, 0.5, 0.5, 2.5, 2.5, 2.5))) == [1, 2]
+    assert list(select_region(data, tree_id=1, bbox=(0.5, 0.5, 0.5, 2.5, 2.5, 2.5))) == [1]
+
+
+def test_truncated_level_covers_whole_extent():
+    """Test that a budget cut inside a level is not biased by the file's point order."""
+    rng = np.random.default_rng(3)
+    xyz = rng.uniform(0, 100, size=(400_000, 3))
+    xyz = xyz[np.argsort(xyz[:, 0])]  # Stored in X order, as in scan/tile exports
+
+    lod = build_lod_pyramid(xyz, max_levels=12)
+    selected = xyz[select_lod_points(lod, 100_000)]
+
+    assert 0.45 <= np.mean(selected[:, 0] > 50) <= 0.55
+    assert 0.45 <= np.mean(selected[:, 1] > 50) <= 0.55
@@ -0,0 +1,36 @@
+"""
+Tests for the logging configuration.
+"""
+import logging
+import src.logger_config as logger_config
+from src.logger_config import setup_logging, stop_logging
+
+
+def test_setup_logging_writes_through_queue(tmp_path):
+    """Test that records logged through the queue reach the log file."""
+    root = logging.getLogger()
+    original_handlers, original_level = root.handlers[:], root.level
+    log_file = tmp_path / "logs" / "test.log"
+
+    try:
+        setup_logging(str(log_file), 'INFO')
+        logger = logging.getLogger("tests.logger_config")
+        logger.info("Tree %d height: %.3fm", 7, 12.5)
+        logger.debug("Not written at INFO level")
+        tree_ids = [1, 2]
+        logger.info("Trees: %s", tree_ids)
+        tree_ids.append(3)
+        worker_queue_created = logger_config._worker_log_queue is not None
+        stop_logging()
+    finally:
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in original_handlers:
+            root.addHandler(handler)
+        root.setLevel(original_level)
+
+    content = log_file.read_text()
+    assert "INFO - Tree 7 height: 12.500m" in content
+    assert "Not written" not in content
+    assert "Trees: [1, 2]\n" in content
+    assert not worker_queue_created
@@ -2,7 +2,7 @@
 Tests for preprocessing functions.
 """
 import numpy as np
-from src.preprocessing import group_points_by_trees, get_points_at_height
+from src.preprocessing import build_tree_index, group_points_by_trees, get_points_at_height
 import config
 
 
@@ -46,4 +46,30 @@ def test_get_points_at_height():
     assert len(result) == 3
     assert np.array_equal(result[0], np.array([1, 1, 1.25]))
     assert np.array_equal(result[1], np.array([2, 2, 1.3]))
-    assert np.array_equal(result[2], np.array([3, 3, 1.35]))
\ No newline at end of file
+    assert np.array_equal(result[2], np.array([3, 3, 1.35]))
+
+def test_build_tree_index():
+    """Test per-tree counts, bounding boxes, class counts and breast-height points."""
+    xyz = np.array([
+        [0, 0, 0.0],  # Tree 2
+        [1, 1, 1.3],  # Tree 1, trunk at breast height
+        [2, 2, 5.0],  # Tree 1
+        [3, 3, 1.3],  # Tree 2, trunk at breast height
+        [4, 4, 9.0],  # Tree 2
+        [5, 5, 0.0],  # Ground
+    ])
+    classification = np.array([0, 1, 3, 1, 3, 0])
+    tree_id = np.array([2, 1, 1, 2, 2, 0])
+
+    index = build_tree_index(xyz, classification, tree_id)
+
+    assert list(index['tree_ids']) == [0, 1, 2]
+    assert list(index['point_counts']) == [1, 2, 3]
+    assert list(index['dbh_points']) == [0, 1, 1]
+    assert np.array_equal(index['bbox_min'][2], [0, 0, 0.0])
+    assert np.array_equal(index['bbox_max'][2], [4, 4, 9.0])
+    assert list(index['classes']) == [0, 1, 3]
+    assert np.array_equal(index['class_counts'], [[1, 0, 0], [0, 1, 1], [1, 1, 1]])
+
+    tree_2 = index['order'][index['offsets'][2]:index['offsets'][2] + index['point_counts'][2]]
+    assert list(tree_2) == [0, 3, 4]
@@ -1,8 +1,10 @@
 """
 Tests for the point cloud processing pipeline.
 """
+import logging
 import config
 import numpy as np
+from src.preprocessing import build_tree_index
 from src.processor import process_point_cloud
 
 
@@ -33,4 +35,31 @@ def test_process_point_cloud():
         assert metrics[1]['height'] == 10.0
         assert 0.18 <= metrics[1]['dbh'] <= 0.22
     finally:
-        config.DBH_MIN_POINTS = original_min_points
\ No newline at end of file
+        config.DBH_MIN_POINTS = original_min_points
+
+
+def test_process_point_cloud_skips_undersized_trees(caplog):
+    """Test that trees without enough breast-height points get no DBH and one summary warning."""
+    data = {
+        'xyz': np.array([
+            [0, 0, 0],
+            [0.1, 0, 1.3],
+            [0, 0, 8],
+            [5, 5, 0],
+            [5, 5, 6],
+        ]),
+        'classification': np.array([1, 1, 3, 1, 3]),
+        'tree_id': np.array([1, 1, 1, 2, 2])
+    }
+    data['tree_index'] = build_tree_index(data['xyz'], data['classification'], data['tree_id'])
+
+    with caplog.at_level(logging.WARNING):
+        metrics = process_point_cloud(data)
+
+    assert metrics[1]['height'] == 8.0
+    assert metrics[1]['dbh'] is None
+    assert metrics[2]['dbh'] is None
+    warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "Skipped DBH for 2 of 2 trees" in warnings[0].getMessage()
+    assert 'order' in data['tree_index']
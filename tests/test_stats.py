@@ -0,0 +1,88 @@
+"""
+Tests for the streaming statistics accumulator.
+"""
+import numpy as np
+import pytest
+from src.stats import StreamingStats
+
+
+def test_streaming_stats_matches_numpy():
+    """Test exact moments and approximate percentiles against NumPy."""
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0.1, 40.0, size=5000)
+
+    stats = StreamingStats()
+    stats.update_many(values)
+
+    assert stats.count == 5000
+    assert stats.min == values.min()
+    assert stats.max == values.max()
+    assert stats.mean == pytest.approx(np.mean(values))
+    assert stats.std == pytest.approx(np.std(values))
+    for q in (0.05, 0.5, 0.95):
+        assert stats.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.02)
+
+
+def test_streaming_stats_merge():
+    """Test that merging partial accumulators equals accumulating everything."""
+    rng = np.random.default_rng(1)
+    values = rng.normal(20.0, 3.0, size=1000)
+
+    whole = StreamingStats()
+    whole.update_many(values)
+
+    left, right = StreamingStats(), StreamingStats()
+    for v in values[:300]:
+        left.update(v)
+    right.update_many(values[300:])
+    merged = left.merge(right)
+
+    assert merged.count == whole.count
+    assert merged.mean == pytest.approx(whole.mean)
+    assert merged.std == pytest.approx(whole.std)
+    assert merged.quantile(0.5) == whole.quantile(0.5)
+
+
+def test_streaming_stats_empty_and_missing():
+    """Test that None and non-finite values are ignored and empty summaries hold None."""
+    stats = StreamingStats()
+    stats.update_many([None, None, np.inf, -np.inf, np.nan])
+    stats.update(float('inf'))
+    stats.update(float('-inf'))
+    stats.update(None)
+
+    summary = stats.to_dict()
+    assert summary['count'] == 0
+    assert summary['mean'] is None
+    assert summary['p50'] is None
+
+
+def test_streaming_stats_scalar_matches_batch():
+    """Test that scalar updates give the same result as a batch update."""
+    values = np.array([-2.5, 0.0, 0.3, 1.7, 12.0, 25.4, np.nan])
+
+    scalar, batch = StreamingStats(), StreamingStats()
+    for v in values:
+        scalar.update(v)
+    batch.update_many(values)
+
+    assert scalar.count == batch.count == 6
+    assert scalar.mean == pytest.approx(batch.mean)
+    assert scalar.std == pytest.approx(batch.std)
+    assert scalar.to_dict() == pytest.approx(batch.to_dict())
+
+
+@pytest.mark.parametrize("values", [
+    [1e-9, 5.0],
+    [2.0, 4.0, 9.0],
+    [0.0, 1.5, 3.0, 12.0, 30.0],
+    [-4.0, -1.0, 2.0, 8.0],
+])
+def test_streaming_stats_small_n_percentiles(values):
+    """Test that percentiles of small runs interpolate like np.percentile."""
+    stats = StreamingStats()
+    stats.update_many(values)
+
+    summary = stats.to_dict(percentiles=(5, 25, 50, 75, 95))
+    for p in (5, 25, 50, 75, 95):
+        assert summary[f"p{p}"] == pytest.approx(np.percentile(values, p), rel=0.02, abs=1e-9)